@@ -0,0 +1,121 @@
+#!/usr/bin/env python3
+"""
+Apply word_overrides.json to the existing database without a full
+vocabulary rebuild. Only the overridden words are updated (ids are kept)
+and only the sentences containing them have their links checked. Word audio
+is synthesized from the hanzi, so it does not depend on the chosen reading
+and is left unchanged.
+
+Usage:
+    python scripts/apply_overrides.py        # all words in word_overrides.json
+    python scripts/apply_overrides.py 说 着  # only these words (e.g. removed overrides)
+"""
+
+import argparse
+import json
+import sqlite3
+import time
+
+from build_hsk_index import HskIndex, open_index
+from import_hsk_words import (
+    DB_FILE,
+    build_word,
+    ensure_words_table,
+    is_target_entry,
+    upsert_words,
+)
+from word_forms import load_overrides
+
+
+def load_entries(index: HskIndex, hanzi_list: list[str]) -> dict[str, dict]:
+    """Find the dataset entries for the given words: {hanzi: entry}.
+
+    The first target-level entry wins, matching import_hsk_words.py.
+    """
+    entries = {}
+    for hanzi in hanzi_list:
+        for entry in index.get(hanzi):
+            if is_target_entry(entry):
+                entries[hanzi] = entry
+                break
+    return entries
+
+
+def relink_sentences(cursor, words: dict[str, int]) -> int:
+    """Fix sentence_words links for sentences whose tokens contain the given words.
+
+    `words` maps hanzi to word id. Links that already match the tokens are left
+    alone. Returns the number of sentences re-linked.
+    """
+    cursor.execute("SELECT name FROM sqlite_master WHERE type = 'table' AND name = 'sentence_words'")
+    if cursor.fetchone() is None:
+        return 0
+
+    relinked = set()
+    for hanzi, word_id in words.items():
+        # Tokens are stored with json.dumps, so search for the encoded token
+        cursor.execute("SELECT id, tokens FROM sentences WHERE instr(tokens, ?) > 0", (json.dumps(hanzi),))
+        for sentence_id, tokens in cursor.fetchall():
+            count = json.loads(tokens).count(hanzi)
+            if not count:
+                continue
+            cursor.execute(
+                "SELECT COUNT(*) FROM sentence_words WHERE sentence_id = ? AND word_id = ?", (sentence_id, word_id)
+            )
+            if cursor.fetchone()[0] == count:
+                continue
+            cursor.execute("DELETE FROM sentence_words WHERE sentence_id = ? AND word_id = ?", (sentence_id, word_id))
+            cursor.executemany("""
+                INSERT INTO sentence_words (sentence_id, word_id)
+                VALUES (?, ?)
+            """, [(sentence_id, word_id)] * count)
+            relinked.add(sentence_id)
+    return len(relinked)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Apply word overrides without a full re-import")
+    parser.add_argument("hanzi", nargs="*", help="words to re-apply (default: every word in word_overrides.json)")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+
+    overrides = load_overrides()
+    hanzi_list = args.hanzi or list(overrides)
+    if not hanzi_list:
+        print("No overrides to apply")
+        return
+
+    index = open_index()
+    entries = load_entries(index, hanzi_list)
+    missing = [h for h in hanzi_list if h not in entries]
+    if missing:
+        print(f"Not in HSK 1-3 dataset, skipping: {', '.join(missing)}")
+
+    # Words without an override entry fall back to the default form selection
+    words = [build_word(entries[h], overrides) for h in hanzi_list if h in entries]
+    index.close()
+
+    conn = sqlite3.connect(DB_FILE)
+    cursor = conn.cursor()
+
+    ensure_words_table(cursor)
+    inserted_ids, updated_ids, pinyin_changed_ids = upsert_words(cursor, words)
+
+    # Word ids are kept, so only sentences containing these words need their links checked
+    applied = [w["hanzi"] for w in words]
+    cursor.execute(f"SELECT hanzi, id FROM words WHERE hanzi IN ({','.join('?' * len(applied))})", applied)
+    relinked = relink_sentences(cursor, dict(cursor.fetchall()))
+
+    conn.commit()
+    conn.close()
+
+    elapsed_ms = (time.perf_counter() - start) * 1000
+    print(f"Applied {len(words)} overrides in {elapsed_ms:.0f} ms:")
+    print(f"  Inserted: {len(inserted_ids)} words")
+    print(f"  Updated: {len(updated_ids)} words ({len(pinyin_changed_ids)} with new pinyin)")
+    print(f"  Re-linked: {relinked} sentences")
+
+
+if __name__ == "__main__":
+    main()
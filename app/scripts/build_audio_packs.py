@@ -0,0 +1,222 @@
+#!/usr/bin/env python3
+"""
+Concatenate word and sentence audio clips into per-HSK-level pack files
+with a byte-offset index, so the client can fetch a whole level at once
+or individual clips with HTTP range requests.
+"""
+
+import hashlib
+import json
+import os
+import sqlite3
+from pathlib import Path
+
+DB_FILE = Path(__file__).parent.parent / "chinese.db"
+PUBLIC_DIR = Path(__file__).parent.parent / "public"
+PACKS_DIR = PUBLIC_DIR / "audio" / "packs"
+INDEX_FILE = PACKS_DIR / "index.json"
+
+INDEX_VERSION = 2
+
+# MPEG audio bitrate tables (kbps) for Layer III, indexed by header bits
+BITRATES_MPEG1 = [0, 32, 40, 48, 56, 64, 80, 96, 112, 128, 160, 192, 224, 256, 320, 0]
+BITRATES_MPEG2 = [0, 8, 16, 24, 32, 40, 48, 56, 64, 80, 96, 112, 128, 144, 160, 0]
+SAMPLE_RATES = {
+    3: [44100, 48000, 32000],  # MPEG 1
+    2: [22050, 24000, 16000],  # MPEG 2
+    0: [11025, 12000, 8000],   # MPEG 2.5
+}
+
+
+def skip_id3(data: bytes) -> int:
+    """Return the offset of the first byte after an ID3v2 tag, if any."""
+    if len(data) >= 10 and data[:3] == b"ID3":
+        size = (data[6] << 21) | (data[7] << 14) | (data[8] << 7) | data[9]
+        return 10 + size
+    return 0
+
+
+def mp3_duration(data: bytes) -> float:
+    """Calculate MP3 duration in seconds by walking the frame headers."""
+    pos = skip_id3(data)
+    duration = 0.0
+
+    while pos + 4 <= len(data):
+        header = int.from_bytes(data[pos:pos + 4], "big")
+        if (header >> 21) & 0x7FF != 0x7FF:
+            pos += 1
+            continue
+
+        version = (header >> 19) & 0x3
+        layer = (header >> 17) & 0x3
+        bitrate_index = (header >> 12) & 0xF
+        rate_index = (header >> 10) & 0x3
+        padding = (header >> 9) & 0x1
+
+        # Only Layer III is expected from edge-tts / ffmpeg output
+        if version == 1 or layer != 1 or rate_index == 3 or bitrate_index in (0, 15):
+            pos += 1
+            continue
+
+        sample_rate = SAMPLE_RATES[version][rate_index]
+        if version == 3:
+            bitrate = BITRATES_MPEG1[bitrate_index] * 1000
+            samples = 1152
+            frame_length = 144 * bitrate // sample_rate + padding
+        else:
+            bitrate = BITRATES_MPEG2[bitrate_index] * 1000
+            samples = 576
+            frame_length = 72 * bitrate // sample_rate + padding
+
+        duration += samples / sample_rate
+        pos += frame_length
+
+    return duration
+
+
+def file_signature(path: Path) -> list[int]:
+    """Cheap change signature for a clip (size + mtime)."""
+    stat = path.stat()
+    return [stat.st_size, stat.st_mtime_ns]
+
+
+def load_clips(cursor) -> dict[str, list[tuple[int, str]]]:
+    """Group clips into packs: {pack_name: [(id, audio_path), ...]}."""
+    packs: dict[str, list[tuple[int, str]]] = {}
+
+    cursor.execute("""
+        SELECT id, hsk_level, audio_path FROM words
+        WHERE audio_path IS NOT NULL
+        ORDER BY hsk_level, id
+    """)
+    for word_id, level, audio_path in cursor.fetchall():
+        packs.setdefault(f"words-hsk{level}", []).append((word_id, audio_path))
+
+    # A sentence belongs to the highest HSK level among its linked words
+    cursor.execute("""
+        SELECT s.id, COALESCE(MAX(w.hsk_level), 0) AS level, s.audio_path
+        FROM sentences s
+        LEFT JOIN sentence_words sw ON s.id = sw.sentence_id
+        LEFT JOIN words w ON sw.word_id = w.id
+        WHERE s.audio_path IS NOT NULL
+        GROUP BY s.id
+        ORDER BY level, s.id
+    """)
+    for sentence_id, level, audio_path in cursor.fetchall():
+        packs.setdefault(f"sentences-hsk{level}", []).append((sentence_id, audio_path))
+
+    return packs
+
+
+def load_index() -> dict:
+    """Load the existing pack index, or an empty one."""
+    if INDEX_FILE.exists():
+        with open(INDEX_FILE, "r", encoding="utf-8") as f:
+            index = json.load(f)
+        if index.get("version") == INDEX_VERSION:
+            return index
+    return {"version": INDEX_VERSION, "packs": {}}
+
+
+def build_pack(name: str, clips: list[tuple[int, str]]) -> dict:
+    """Concatenate clips into a pack file and return its index entry."""
+    tmp_file = PACKS_DIR / f"{name}.mp3.tmp"
+    entries = {}
+    signatures = {}
+    digest = hashlib.sha1()
+    offset = 0
+
+    with open(tmp_file, "wb") as out:
+        for clip_id, audio_path in clips:
+            clip_file = PUBLIC_DIR / audio_path.lstrip("/")
+            data = clip_file.read_bytes()
+            start = skip_id3(data)
+            frames = data[start:]
+
+            out.write(frames)
+            digest.update(frames)
+            entries[str(clip_id)] = [offset, len(frames), round(mp3_duration(frames), 3)]
+            signatures[audio_path] = file_signature(clip_file)
+            offset += len(frames)
+
+    # Versioned name: a rebuild moves every offset, so cached packs must not be reused
+    pack_hash = digest.hexdigest()[:12]
+    pack_file = PACKS_DIR / f"{name}.{pack_hash}.mp3"
+    os.replace(tmp_file, pack_file)
+
+    return {
+        "file": f"/audio/packs/{pack_file.name}",
+        "bytes": offset,
+        "hash": pack_hash,
+        "entries": entries,
+        "sources": signatures,
+    }
+
+
+def main():
+    PACKS_DIR.mkdir(parents=True, exist_ok=True)
+
+    print(f"Connecting to database at {DB_FILE}...")
+    conn = sqlite3.connect(DB_FILE)
+    cursor = conn.cursor()
+
+    packs = load_clips(cursor)
+    conn.close()
+
+    index = load_index()
+    old_packs = index["packs"]
+    new_packs = {}
+    rebuilt = 0
+    missing = 0
+
+    for name, clips in packs.items():
+        # Drop clips whose files have not been generated yet
+        present = []
+        for clip_id, audio_path in clips:
+            if (PUBLIC_DIR / audio_path.lstrip("/")).exists():
+                present.append((clip_id, audio_path))
+            else:
+                missing += 1
+        if not present:
+            continue
+
+        # Rebuild only if the member list or any member file changed
+        old = old_packs.get(name)
+        signatures = {p: file_signature(PUBLIC_DIR / p.lstrip("/")) for _, p in present}
+        member_ids = [str(clip_id) for clip_id, _ in present]
+        if (
+            old
+            and old.get("sources") == signatures
+            and list(old.get("entries", {})) == member_ids
+            and (PUBLIC_DIR / old["file"].lstrip("/")).exists()
+        ):
+            new_packs[name] = old
+            continue
+
+        print(f"  Building {name} ({len(present)} clips)...")
+        new_packs[name] = build_pack(name, present)
+        rebuilt += 1
+
+    index = {"version": INDEX_VERSION, "packs": new_packs}
+    with open(INDEX_FILE, "w", encoding="utf-8") as f:
+        json.dump(index, f, ensure_ascii=False, separators=(",", ":"))
+
+    # Remove superseded pack versions and packs that no longer have any clips
+    current_files = {Path(p["file"]).name for p in new_packs.values()}
+    for pack_file in PACKS_DIR.glob("*.mp3"):
+        if pack_file.name not in current_files:
+            pack_file.unlink()
+
+    total_clips = sum(len(p["entries"]) for p in new_packs.values())
+    total_bytes = sum(p["bytes"] for p in new_packs.values())
+
+    print(f"\n=== Audio packs complete ===")
+    print(f"  Packs: {len(new_packs)} ({rebuilt} rebuilt)")
+    print(f"  Clips: {total_clips} ({total_bytes / 1024 / 1024:.1f} MB)")
+    if missing:
+        print(f"  Skipped {missing} clips with missing files")
+    print(f"  Index: {INDEX_FILE}")
+
+
+if __name__ == "__main__":
+    main()
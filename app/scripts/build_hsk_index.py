@@ -0,0 +1,184 @@
+#!/usr/bin/env python3
+"""
+Compile hsk-complete.json into an indexed SQLite file (data/hsk-index.db)
+so imports and the app can look up entries by simplified/traditional form
+without re-parsing the full JSON dataset.
+
+The index is rebuilt automatically by open_index() when the JSON or
+word_overrides.json (which picks the stored readings) changes.
+"""
+
+import json
+import os
+import sqlite3
+import time
+from pathlib import Path
+
+from word_forms import DATA_DIR, HSK_FILE, OVERRIDES_FILE, load_overrides, select_best_form
+
+INDEX_FILE = DATA_DIR / "hsk-index.db"
+
+# Bump when the index layout changes to force a rebuild
+INDEX_VERSION = "2"
+
+
+def source_signature() -> str:
+    """Cheap signature (size + mtime) of the source JSON and the overrides."""
+    signature = []
+    for path in (HSK_FILE, OVERRIDES_FILE):
+        if path.exists():
+            stat = path.stat()
+            signature.append(f"{stat.st_size}:{stat.st_mtime_ns}")
+        else:
+            signature.append("-")
+    return ",".join(signature)
+
+
+def build_index():
+    """Compile the full dataset (all levels and forms) into INDEX_FILE."""
+    with open(HSK_FILE, "r", encoding="utf-8") as f:
+        data = json.load(f)
+    overrides = load_overrides()
+
+    tmp_file = INDEX_FILE.with_name(INDEX_FILE.name + ".tmp")
+    if tmp_file.exists():
+        tmp_file.unlink()
+
+    conn = sqlite3.connect(tmp_file)
+    cursor = conn.cursor()
+
+    cursor.execute("CREATE TABLE meta (key TEXT PRIMARY KEY, value TEXT)")
+    # pinyin is the reading selected for learning (same rules as the words import)
+    cursor.execute("""
+        CREATE TABLE entries (
+            id INTEGER PRIMARY KEY,
+            simplified TEXT NOT NULL,
+            traditional TEXT,
+            pinyin TEXT,
+            levels TEXT,
+            frequency INTEGER,
+            data TEXT NOT NULL
+        )
+    """)
+    cursor.execute("CREATE TABLE entry_levels (level TEXT NOT NULL, entry_id INTEGER NOT NULL)")
+    # kind: simplified or traditional
+    cursor.execute("CREATE TABLE lookup (key TEXT NOT NULL, kind TEXT NOT NULL, entry_id INTEGER NOT NULL)")
+
+    entries = []
+    levels = []
+    keys = set()
+
+    for entry_id, entry in enumerate(data, start=1):
+        simplified = entry.get("simplified", "")
+        forms = entry.get("forms", [])
+        selected = select_best_form(forms, simplified, overrides)
+
+        entries.append((
+            entry_id,
+            simplified,
+            selected.get("traditional", simplified),
+            selected.get("transcriptions", {}).get("pinyin", ""),
+            json.dumps(entry.get("level", []), ensure_ascii=False),
+            entry.get("frequency", 0),
+            json.dumps(entry, ensure_ascii=False, separators=(",", ":")),
+        ))
+        levels.extend((level, entry_id) for level in entry.get("level", []))
+
+        keys.add((simplified, "simplified", entry_id))
+        for form in forms:
+            if form.get("traditional"):
+                keys.add((form["traditional"], "traditional", entry_id))
+
+    cursor.executemany("INSERT INTO entries VALUES (?, ?, ?, ?, ?, ?, ?)", entries)
+    cursor.executemany("INSERT INTO entry_levels VALUES (?, ?)", levels)
+    cursor.executemany("INSERT INTO lookup VALUES (?, ?, ?)", sorted(keys))
+
+    cursor.execute("CREATE INDEX idx_entries_simplified ON entries(simplified)")
+    cursor.execute("CREATE INDEX idx_entry_levels_level ON entry_levels(level)")
+    cursor.execute("CREATE INDEX idx_lookup_key ON lookup(key)")
+
+    cursor.executemany("INSERT INTO meta VALUES (?, ?)", [
+        ("version", INDEX_VERSION),
+        ("source_signature", source_signature()),
+        ("entry_count", str(len(entries))),
+    ])
+
+    conn.commit()
+    cursor.execute("VACUUM")
+    conn.close()
+
+    # The app opens the index per lookup, so nothing holds it open while it is replaced
+    os.replace(tmp_file, INDEX_FILE)
+    return len(entries), len(keys)
+
+
+def is_index_fresh() -> bool:
+    """Check whether INDEX_FILE was built from the current hsk-complete.json and overrides."""
+    if not INDEX_FILE.exists():
+        return False
+    if not HSK_FILE.exists():
+        # Source removed: keep using the compiled index
+        return True
+    conn = sqlite3.connect(INDEX_FILE)
+    try:
+        meta = dict(conn.execute("SELECT key, value FROM meta").fetchall())
+    except sqlite3.DatabaseError:
+        return False
+    finally:
+        conn.close()
+    return meta.get("version") == INDEX_VERSION and meta.get("source_signature") == source_signature()
+
+
+class HskIndex:
+    """Read access to the compiled index. Entries are returned as in hsk-complete.json."""
+
+    def __init__(self, path: Path = INDEX_FILE):
+        self.conn = sqlite3.connect(path)
+
+    def close(self):
+        self.conn.close()
+
+    def count(self) -> int:
+        return self.conn.execute("SELECT COUNT(*) FROM entries").fetchone()[0]
+
+    def get(self, simplified: str) -> list[dict]:
+        """All entries for a simplified form, in dataset order."""
+        rows = self.conn.execute(
+            "SELECT data FROM entries WHERE simplified = ? ORDER BY id", (simplified,)
+        ).fetchall()
+        return [json.loads(data) for (data,) in rows]
+
+    def entries_for_levels(self, levels: set[str]) -> list[dict]:
+        """Entries tagged with any of the given levels, in dataset order."""
+        placeholders = ",".join("?" * len(levels))
+        rows = self.conn.execute(f"""
+            SELECT data FROM entries
+            WHERE id IN (SELECT entry_id FROM entry_levels WHERE level IN ({placeholders}))
+            ORDER BY id
+        """, list(levels)).fetchall()
+        return [json.loads(data) for (data,) in rows]
+
+
+def open_index() -> HskIndex:
+    """Open the compiled index, (re)building it if hsk-complete.json changed."""
+    if not is_index_fresh():
+        print(f"Compiling HSK index from {HSK_FILE}...")
+        build_index()
+    return HskIndex()
+
+
+def main():
+    print(f"Compiling HSK index from {HSK_FILE}...")
+    start = time.perf_counter()
+    entry_count, key_count = build_index()
+    elapsed = time.perf_counter() - start
+
+    print(f"\n=== HSK index complete ===")
+    print(f"  Entries: {entry_count}")
+    print(f"  Lookup keys: {key_count}")
+    print(f"  Size: {INDEX_FILE.stat().st_size / 1024:.0f} KB ({elapsed:.1f}s)")
+    print(f"  Index: {INDEX_FILE}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,200 @@
+#!/usr/bin/env python3
+"""
+Pre-render read-only API payloads (patterns, words per HSK level, example
+sentences) into compressed static JSON shards with content-hash ETags.
+Run after tag_patterns.py; only shards whose payload changed are rewritten.
+"""
+
+import gzip
+import hashlib
+import json
+import os
+import re
+import sqlite3
+from pathlib import Path
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+DB_FILE = Path(__file__).parent.parent / "chinese.db"
+STATIC_API_VERSION = "v1"
+STATIC_API_DIR = Path(__file__).parent.parent / "public" / "api-static" / STATIC_API_VERSION
+MANIFEST_FILE = STATIC_API_DIR / "manifest.json"
+
+# Columns stored as JSON text (mode: "json" in schema.ts)
+JSON_COLUMNS = {"tokens", "definitions", "classifiers"}
+
+# Same limits as the API routes
+PATTERN_SENTENCE_LIMIT = 10
+WORD_SENTENCE_LIMIT = 20
+
+
+def to_camel(name: str) -> str:
+    """Convert a snake_case column name to the camelCase key Drizzle returns."""
+    return re.sub(r"_([a-z])", lambda m: m.group(1).upper(), name)
+
+
+def fetch_rows(cursor, query: str, params: tuple = ()) -> list[dict]:
+    """Run a query and return rows shaped like Drizzle's select() output."""
+    cursor.execute(query, params)
+    columns = [d[0] for d in cursor.description]
+    rows = []
+    for values in cursor.fetchall():
+        row = {}
+        for column, value in zip(columns, values):
+            if column in JSON_COLUMNS and value is not None:
+                value = json.loads(value)
+            row[to_camel(column)] = value
+        rows.append(row)
+    return rows
+
+
+def build_token_data(sentences: list[dict], words_by_hanzi: dict[str, dict]) -> dict:
+    """Build the {hanzi: {pinyin, definition}} map returned alongside sentences."""
+    token_data = {}
+    for sentence in sentences:
+        for token in sentence.get("tokens") or []:
+            word = words_by_hanzi.get(token)
+            if word:
+                token_data[token] = {"pinyin": word["pinyin"], "definition": word["definition"]}
+    return token_data
+
+
+def build_payloads(cursor) -> dict[str, object]:
+    """Render every shard payload: {relative_path: payload}."""
+    payloads = {}
+
+    # Token lookups use every word, like getWordsByHanziList() in the routes
+    words_by_hanzi = {w["hanzi"]: w for w in fetch_rows(cursor, "SELECT * FROM words ORDER BY id")}
+
+    # Only imported vocabulary gets shards; user-added words (level 0) are not import-time content
+    words = fetch_rows(cursor, "SELECT * FROM words WHERE hsk_level > 0 ORDER BY hsk_level, frequency, id")
+
+    # Full word list per level in /api/words order. Unlike the route this is not
+    # paginated and has no learnedWordIds, which depend on the user's progress.
+    levels: dict[int, list[dict]] = {}
+    for word in words:
+        levels.setdefault(word["hskLevel"], []).append(word)
+    for level, level_words in levels.items():
+        payloads[f"words/hsk{level}.json"] = {"words": level_words, "total": len(level_words)}
+
+    # /api/patterns
+    patterns = fetch_rows(cursor, "SELECT * FROM patterns ORDER BY id")
+    payloads["patterns.json"] = patterns
+
+    # /api/patterns?patternId=N
+    for pattern in patterns:
+        sentences = fetch_rows(cursor, """
+            SELECT s.* FROM sentences s
+            JOIN sentence_patterns sp ON s.id = sp.sentence_id
+            WHERE sp.pattern_id = ?
+            ORDER BY s.id
+            LIMIT ?
+        """, (pattern["id"], PATTERN_SENTENCE_LIMIT))
+        payloads[f"patterns/{pattern['id']}.json"] = {
+            "sentences": sentences,
+            "tokenData": build_token_data(sentences, words_by_hanzi),
+        }
+
+    # /api/words/[id]/sentences
+    for word in words:
+        sentences = fetch_rows(cursor, """
+            SELECT s.* FROM sentences s
+            WHERE s.id IN (SELECT sentence_id FROM sentence_words WHERE word_id = ?)
+            ORDER BY s.difficulty_score
+            LIMIT ?
+        """, (word["id"], WORD_SENTENCE_LIMIT))
+        payloads[f"words/{word['id']}/sentences.json"] = {
+            "sentences": sentences,
+            "tokenData": build_token_data(sentences, words_by_hanzi),
+        }
+
+    return payloads
+
+
+def write_atomic(path: Path, data: bytes):
+    """Write a file via a temp file so readers never see a partial shard."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_name(path.name + ".tmp")
+    tmp_path.write_bytes(data)
+    os.replace(tmp_path, path)
+
+
+def shard_files(relative_path: str) -> list[Path]:
+    """All files written for a shard (plain and compressed variants)."""
+    base = STATIC_API_DIR / relative_path
+    files = [base, base.with_name(base.name + ".gz")]
+    if brotli:
+        files.append(base.with_name(base.name + ".br"))
+    return files
+
+
+def write_shard(relative_path: str, data: bytes):
+    """Write the plain, gzip and (if available) brotli variants of a shard."""
+    base = STATIC_API_DIR / relative_path
+    write_atomic(base, data)
+    write_atomic(base.with_name(base.name + ".gz"), gzip.compress(data, compresslevel=9, mtime=0))
+    if brotli:
+        write_atomic(base.with_name(base.name + ".br"), brotli.compress(data, quality=11))
+
+
+def load_manifest() -> dict:
+    """Load the existing shard manifest, or an empty one."""
+    if MANIFEST_FILE.exists():
+        with open(MANIFEST_FILE, "r", encoding="utf-8") as f:
+            return json.load(f)
+    return {"version": STATIC_API_VERSION, "shards": {}}
+
+
+def main():
+    print(f"Connecting to database at {DB_FILE}...")
+    conn = sqlite3.connect(DB_FILE)
+    cursor = conn.cursor()
+
+    payloads = build_payloads(cursor)
+    conn.close()
+    print(f"Rendered {len(payloads)} shards")
+
+    if brotli is None:
+        print("brotli not installed, skipping .br files (pip install brotli)")
+
+    old_shards = load_manifest()["shards"]
+    shards = {}
+    written = 0
+
+    for relative_path, payload in payloads.items():
+        data = json.dumps(payload, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+        etag = hashlib.sha1(data).hexdigest()[:16]
+        shards[relative_path] = {"etag": etag, "bytes": len(data)}
+
+        old = old_shards.get(relative_path)
+        if old and old["etag"] == etag and all(p.exists() for p in shard_files(relative_path)):
+            continue
+
+        write_shard(relative_path, data)
+        written += 1
+
+    # Remove shards that are no longer produced (e.g. deleted words/patterns)
+    removed = 0
+    for relative_path in set(old_shards) - set(shards):
+        base = STATIC_API_DIR / relative_path
+        for path in (base, base.with_name(base.name + ".gz"), base.with_name(base.name + ".br")):
+            if path.exists():
+                path.unlink()
+        removed += 1
+
+    manifest = {"version": STATIC_API_VERSION, "shards": shards}
+    write_atomic(MANIFEST_FILE, json.dumps(manifest, separators=(",", ":")).encode("utf-8"))
+
+    print(f"\n=== Static API build complete ===")
+    print(f"  Written: {written} shards")
+    print(f"  Unchanged: {len(shards) - written} shards")
+    if removed:
+        print(f"  Removed: {removed} shards")
+    print(f"  Output: {STATIC_API_DIR}")
+
+
+if __name__ == "__main__":
+    main()
@@ -35,7 +35,10 @@ def main():
     # Step 3: Tag patterns
     run_script("tag_patterns.py", "Tag sentences with grammar patterns")
 
-    # Step 4: Generate audio (optional - can be slow)
+    # Step 4: Pre-render static API shards
+    run_script("build_static_api.py", "Pre-render read-only API payloads to static JSON")
+
+    # Step 5: Generate audio (optional - can be slow)
     print(f"\n{'='*60}")
     print("Step: Audio generation")
     print("=" * 60)
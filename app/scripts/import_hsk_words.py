@@ -8,10 +8,10 @@ import json
 import sqlite3
 from pathlib import Path
 
+from build_hsk_index import open_index
+from word_forms import HSK_FILE, load_overrides, select_best_form
+
 # Paths
-DATA_DIR = Path(__file__).parent.parent.parent / "data"
-HSK_FILE = DATA_DIR / "hsk-complete.json"
-OVERRIDES_FILE = DATA_DIR / "word_overrides.json"
 DB_FILE = Path(__file__).parent.parent / "chinese.db"
 
 # HSK levels to import
@@ -28,129 +28,67 @@ def get_hsk_level_number(levels: list[str]) -> int:
     return 0
 
 
-def is_unsuitable_form(form: dict) -> bool:
-    """Check if a form should be skipped (surname, archaic, variant, etc.)."""
-    meanings = form.get("meanings", [])
-    if not meanings:
-        return True
-    first_meaning = meanings[0].lower()
-    # Skip surname-only, archaic, variant, and euphemistic forms
-    skip_patterns = ["surname ", "(archaic)", "variant of", "old variant", "euphemistic"]
-    return any(p in first_meaning for p in skip_patterns)
-
-
-def load_overrides() -> dict:
-    """Load word overrides from JSON file."""
-    if OVERRIDES_FILE.exists():
-        with open(OVERRIDES_FILE, "r", encoding="utf-8") as f:
-            return json.load(f)
-    return {}
-
+# Columns set by the import (everything except id and audio metadata)
+WORD_COLUMNS = [
+    "hanzi", "traditional", "pinyin", "pinyin_numeric", "definition",
+    "definitions", "hsk_level", "pos", "frequency", "classifiers",
+]
 
-def select_best_form(forms: list[dict], hanzi: str, overrides: dict) -> dict:
-    """Select the best form for HSK learning.
-
-    Priority:
-    1. Check overrides file for manual corrections
-    2. First form with lowercase pinyin (common pronunciation)
-    3. First form that isn't surname/archaic/variant
-    4. Fallback to first form
-    """
-    if not forms:
-        return {}
-
-    # Check overrides first
-    if hanzi in overrides:
-        target_pinyin = overrides[hanzi].get("pinyin")
-        for form in forms:
-            pinyin = form.get("transcriptions", {}).get("pinyin", "")
-            if pinyin == target_pinyin:
-                return form
-
-    # First pass: find first suitable form with lowercase pinyin
-    for form in forms:
-        if is_unsuitable_form(form):
-            continue
-        pinyin = form.get("transcriptions", {}).get("pinyin", "")
-        if pinyin and pinyin[0].islower():
-            return form
+# Columns added after the original schema, created on older databases
+ADDED_COLUMNS = {
+    "audio_duration": "REAL",
+    "audio_bytes": "INTEGER",
+    "audio_hash": "TEXT",
+}
 
-    # Second pass: any suitable form
-    for form in forms:
-        if is_unsuitable_form(form):
-            continue
-        return form
+# Tables holding rows that must go when a word is removed
+DEPENDENT_TABLES = ["sentence_words", "word_progress", "word_tags"]
 
-    # Fallback to first form if all are unsuitable
-    return forms[0]
 
+def is_target_entry(entry: dict) -> bool:
+    """Check if a dataset entry belongs to one of the imported HSK levels."""
+    return any(lvl in TARGET_LEVELS for lvl in entry.get("level", [])) and bool(entry.get("forms"))
 
-def main():
-    print(f"Loading HSK data from {HSK_FILE}...")
-    with open(HSK_FILE, "r", encoding="utf-8") as f:
-        data = json.load(f)
 
-    # Load overrides
-    overrides = load_overrides()
-    if overrides:
-        print(f"Loaded {len(overrides)} word overrides")
+def build_word(entry: dict, overrides: dict) -> dict:
+    """Build a words row from a dataset entry, applying overrides."""
+    levels = entry.get("level", [])
+    hanzi = entry.get("simplified", "")
+    primary_form = select_best_form(entry.get("forms", []), hanzi, overrides)
 
-    print(f"Total entries in dataset: {len(data)}")
+    # Extract data
+    traditional = primary_form.get("traditional", hanzi)
 
-    # Filter to target levels
-    words_to_import = []
-    for entry in data:
-        levels = entry.get("level", [])
-        if not any(lvl in TARGET_LEVELS for lvl in levels):
-            continue
+    transcriptions = primary_form.get("transcriptions", {})
+    pinyin = transcriptions.get("pinyin", "")
+    pinyin_numeric = transcriptions.get("numeric", "")
 
-        # Get the best form
-        forms = entry.get("forms", [])
-        if not forms:
-            continue
+    meanings = primary_form.get("meanings", [])
+    definition = meanings[0] if meanings else ""
 
-        hanzi = entry.get("simplified", "")
-        primary_form = select_best_form(forms, hanzi, overrides)
-
-        # Extract data
-        traditional = primary_form.get("traditional", hanzi)
-
-        transcriptions = primary_form.get("transcriptions", {})
-        pinyin = transcriptions.get("pinyin", "")
-        pinyin_numeric = transcriptions.get("numeric", "")
-
-        meanings = primary_form.get("meanings", [])
-        definition = meanings[0] if meanings else ""
-
-        hsk_level = get_hsk_level_number(levels)
-        pos = ",".join(entry.get("pos", []))
-        frequency = entry.get("frequency", 0)
-        classifiers = primary_form.get("classifiers", [])
-
-        words_to_import.append({
-            "hanzi": hanzi,
-            "traditional": traditional,
-            "pinyin": pinyin,
-            "pinyin_numeric": pinyin_numeric,
-            "definition": definition,
-            "definitions": json.dumps(meanings),
-            "hsk_level": hsk_level,
-            "pos": pos,
-            "frequency": frequency,
-            "classifiers": json.dumps(classifiers),
-        })
+    hsk_level = get_hsk_level_number(levels)
+    pos = ",".join(entry.get("pos", []))
+    frequency = entry.get("frequency", 0)
+    classifiers = primary_form.get("classifiers", [])
 
-    print(f"Words matching HSK 1-3: {len(words_to_import)}")
+    return {
+        "hanzi": hanzi,
+        "traditional": traditional,
+        "pinyin": pinyin,
+        "pinyin_numeric": pinyin_numeric,
+        "definition": definition,
+        "definitions": json.dumps(meanings),
+        "hsk_level": hsk_level,
+        "pos": pos,
+        "frequency": frequency,
+        "classifiers": json.dumps(classifiers),
+    }
 
-    # Create database and insert
-    print(f"Creating database at {DB_FILE}...")
-    conn = sqlite3.connect(DB_FILE)
-    cursor = conn.cursor()
 
-    # Drop and recreate words table for clean import
-    cursor.execute("DROP TABLE IF EXISTS words")
+def ensure_words_table(cursor):
+    """Create the words table and indexes if they don't exist yet."""
     cursor.execute("""
-        CREATE TABLE words (
+        CREATE TABLE IF NOT EXISTS words (
             id INTEGER PRIMARY KEY AUTOINCREMENT,
             hanzi TEXT NOT NULL,
             traditional TEXT,
@@ -162,22 +100,127 @@ def main():
             pos TEXT,
             frequency INTEGER,
             classifiers TEXT,
-            audio_path TEXT
+            audio_path TEXT,
+            audio_duration REAL,
+            audio_bytes INTEGER,
+            audio_hash TEXT
         )
     """)
 
+    cursor.execute("PRAGMA table_info(words)")
+    columns = {row[1] for row in cursor.fetchall()}
+    for column, column_type in ADDED_COLUMNS.items():
+        if column not in columns:
+            cursor.execute(f"ALTER TABLE words ADD COLUMN {column} {column_type}")
+
     # Create index on hanzi for faster lookups
     cursor.execute("CREATE INDEX IF NOT EXISTS idx_words_hanzi ON words(hanzi)")
     cursor.execute("CREATE INDEX IF NOT EXISTS idx_words_hsk_level ON words(hsk_level)")
 
-    # Insert words
-    cursor.executemany("""
-        INSERT INTO words (hanzi, traditional, pinyin, pinyin_numeric, definition, definitions, hsk_level, pos, frequency, classifiers)
-        VALUES (:hanzi, :traditional, :pinyin, :pinyin_numeric, :definition, :definitions, :hsk_level, :pos, :frequency, :classifiers)
-    """, words_to_import)
+
+def upsert_words(cursor, words: list[dict]) -> tuple[list[int], list[int], list[int]]:
+    """Insert or update words by hanzi, keeping existing ids.
+
+    Returns (inserted_ids, updated_ids, pinyin_changed_ids).
+    """
+    columns = ", ".join(WORD_COLUMNS)
+    cursor.execute(f"SELECT id, {columns} FROM words")
+    existing = {row[1]: row for row in cursor.fetchall()}
+
+    inserted_ids = []
+    updated_ids = []
+    pinyin_changed_ids = []
+
+    for word in words:
+        row = existing.get(word["hanzi"])
+        if row is None:
+            cursor.execute(f"""
+                INSERT INTO words ({columns})
+                VALUES ({", ".join(":" + c for c in WORD_COLUMNS)})
+            """, word)
+            inserted_ids.append(cursor.lastrowid)
+            existing[word["hanzi"]] = (cursor.lastrowid, *(word[c] for c in WORD_COLUMNS))
+            continue
+
+        word_id = row[0]
+        current = dict(zip(WORD_COLUMNS, row[1:]))
+        if all(current[c] == word[c] for c in WORD_COLUMNS):
+            continue
+
+        assignments = ", ".join(f"{c} = :{c}" for c in WORD_COLUMNS)
+        cursor.execute(f"UPDATE words SET {assignments} WHERE id = :id", {**word, "id": word_id})
+        updated_ids.append(word_id)
+        if current["pinyin"] != word["pinyin"]:
+            pinyin_changed_ids.append(word_id)
+
+    return inserted_ids, updated_ids, pinyin_changed_ids
+
+
+def delete_words(cursor, word_ids: list[int]):
+    """Delete words along with their sentence links, progress and tags."""
+    cursor.execute("SELECT name FROM sqlite_master WHERE type = 'table'")
+    tables = {row[0] for row in cursor.fetchall()}
+    params = [(word_id,) for word_id in word_ids]
+    for table in DEPENDENT_TABLES:
+        if table in tables:
+            cursor.executemany(f"DELETE FROM {table} WHERE word_id = ?", params)
+    cursor.executemany("DELETE FROM words WHERE id = ?", params)
+
+
+def main():
+    print(f"Loading HSK data from {HSK_FILE}...")
+    index = open_index()
+
+    # Load overrides
+    overrides = load_overrides()
+    if overrides:
+        print(f"Loaded {len(overrides)} word overrides")
+
+    print(f"Total entries in dataset: {index.count()}")
+
+    # Filter to target levels
+    entries = index.entries_for_levels(TARGET_LEVELS)
+    index.close()
+
+    # Words are keyed by hanzi: keep the first entry in dataset order, as apply_overrides.py does
+    words_to_import = []
+    duplicates = []
+    seen_hanzi = set()
+    for entry in entries:
+        if not is_target_entry(entry):
+            continue
+        word = build_word(entry, overrides)
+        if word["hanzi"] in seen_hanzi:
+            duplicates.append(word)
+            continue
+        seen_hanzi.add(word["hanzi"])
+        words_to_import.append(word)
+
+    print(f"Words matching HSK 1-3: {len(words_to_import)}")
+    if duplicates:
+        print(f"Skipped {len(duplicates)} duplicate entries (first entry kept): "
+              + ", ".join(f"{w['hanzi']} {w['pinyin']}" for w in duplicates))
+
+    # Create database and upsert (keeps word ids stable for progress and sentence links)
+    print(f"Updating database at {DB_FILE}...")
+    conn = sqlite3.connect(DB_FILE)
+    cursor = conn.cursor()
+
+    ensure_words_table(cursor)
+    inserted_ids, updated_ids, _ = upsert_words(cursor, words_to_import)
+
+    # Remove imported words that are no longer in the target levels (user-added words are level 0)
+    imported_hanzi = {w["hanzi"] for w in words_to_import}
+    cursor.execute("SELECT id, hanzi FROM words WHERE hsk_level > 0")
+    stale_ids = [word_id for word_id, hanzi in cursor.fetchall() if hanzi not in imported_hanzi]
+    delete_words(cursor, stale_ids)
 
     conn.commit()
 
+    print(f"  Inserted: {len(inserted_ids)} words")
+    print(f"  Updated: {len(updated_ids)} words")
+    print(f"  Removed: {len(stale_ids)} words")
+
     # Verify
     cursor.execute("SELECT COUNT(*) FROM words")
     count = cursor.fetchone()[0]
@@ -1,14 +1,23 @@
 #!/usr/bin/env python3
 """
-Import Tatoeba sentences, tokenize with jieba, filter by HSK coverage,
-and build word-sentence links.
+Import sentences from all corpus sources (see sentence_sources.py), tokenize
+with jieba, filter by HSK coverage, and build word-sentence links.
+
+Usage:
+    python import_sentences.py                   # all sources
+    python import_sentences.py --source tatoeba  # re-ingest one source only
+    python import_sentences.py --remove-source reader  # delete a dropped corpus
 """
 
+import argparse
 import json
 import sqlite3
 import re
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 from pathlib import Path
 
+from sentence_sources import SentenceRecord, SentenceSource, get_sources
+
 try:
     import jieba
 except ImportError:
@@ -16,13 +25,27 @@ except ImportError:
     exit(1)
 
 # Paths
-DATA_DIR = Path(__file__).parent.parent.parent / "data"
-TATOEBA_FILE = DATA_DIR / "tatoeba-data.tsv"
 DB_FILE = Path(__file__).parent.parent / "chinese.db"
 
 # Minimum HSK coverage (80%)
 MIN_COVERAGE = 0.80
 
+# Columns added after the original schema, created on older databases
+ADDED_COLUMNS = {
+    "audio_duration": "REAL",
+    "audio_bytes": "INTEGER",
+    "audio_hash": "TEXT",
+    "source": "TEXT",
+    "source_id": "TEXT",
+}
+
+# Tables holding rows that must go when a sentence is removed
+DEPENDENT_TABLES = ["sentence_words", "sentence_patterns", "sentence_tags", "sentence_progress"]
+
+# Per-process HSK lookups for tokenization workers
+_hsk_words: dict[str, int] = {}
+_hsk_levels: dict[str, int] = {}
+
 def load_hsk_words(cursor) -> dict[str, int]:
     """Load HSK words from database into a lookup dict {hanzi: id}."""
     cursor.execute("SELECT hanzi, id FROM words")
@@ -86,57 +109,27 @@ def calculate_difficulty(tokens: list[str], hsk_words: dict[str, int], hsk_level
     difficulty = 0.4 * length_score + 0.4 * level_score + 0.2 * non_hsk_ratio
     return difficulty
 
-def main():
-    print(f"Loading Tatoeba data from {TATOEBA_FILE}...")
-
-    # Load sentences
-    sentences = []
-    seen_chinese = set()  # Deduplicate
-
-    with open(TATOEBA_FILE, "r", encoding="utf-8") as f:
-        for line in f:
-            parts = line.strip().split("\t")
-            if len(parts) >= 4:
-                group_id, chinese, eng_id, english = parts[0], parts[1], parts[2], parts[3]
-                # Skip duplicates
-                if chinese not in seen_chinese:
-                    seen_chinese.add(chinese)
-                    sentences.append({
-                        "chinese": chinese,
-                        "english": english,
-                    })
-
-    print(f"Loaded {len(sentences)} unique sentences")
-
-    # Connect to database
-    conn = sqlite3.connect(DB_FILE)
-    cursor = conn.cursor()
-
-    # Load HSK words and levels
-    hsk_words = load_hsk_words(cursor)
-    hsk_levels = load_hsk_levels(cursor)
-    print(f"Loaded {len(hsk_words)} HSK words for filtering")
-
-    # Clear existing data for clean re-import
-    cursor.execute("DROP TABLE IF EXISTS sentence_words")
-    cursor.execute("DROP TABLE IF EXISTS sentences")
-
-    # Create sentences table
+def ensure_schema(cursor):
+    """Create sentence tables, adding provenance columns to older databases."""
     cursor.execute("""
-        CREATE TABLE sentences (
+        CREATE TABLE IF NOT EXISTS sentences (
             id INTEGER PRIMARY KEY AUTOINCREMENT,
             chinese TEXT NOT NULL,
             english TEXT NOT NULL,
             pinyin TEXT,
             difficulty_score REAL,
             audio_path TEXT,
-            tokens TEXT
+            audio_duration REAL,
+            audio_bytes INTEGER,
+            audio_hash TEXT,
+            tokens TEXT,
+            source TEXT,
+            source_id TEXT
         )
     """)
 
-    # Create sentence_words junction table
     cursor.execute("""
-        CREATE TABLE sentence_words (
+        CREATE TABLE IF NOT EXISTS sentence_words (
             id INTEGER PRIMARY KEY AUTOINCREMENT,
             sentence_id INTEGER NOT NULL,
             word_id INTEGER NOT NULL,
@@ -145,63 +138,198 @@ def main():
         )
     """)
 
+    cursor.execute("PRAGMA table_info(sentences)")
+    columns = {row[1] for row in cursor.fetchall()}
+    for column, column_type in ADDED_COLUMNS.items():
+        if column not in columns:
+            cursor.execute(f"ALTER TABLE sentences ADD COLUMN {column} {column_type}")
+    if "source" not in columns:
+        # Imported rows predate multi-corpus support, so they came from Tatoeba
+        cursor.execute("UPDATE sentences SET source = 'tatoeba' WHERE tokens IS NOT NULL")
+
     cursor.execute("CREATE INDEX IF NOT EXISTS idx_sentences_chinese ON sentences(chinese)")
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_sentences_source ON sentences(source)")
     cursor.execute("CREATE INDEX IF NOT EXISTS idx_sentence_words_sentence ON sentence_words(sentence_id)")
     cursor.execute("CREATE INDEX IF NOT EXISTS idx_sentence_words_word ON sentence_words(word_id)")
 
-    # Process sentences
-    imported_count = 0
-    skipped_count = 0
 
-    for sentence in sentences:
-        chinese = sentence["chinese"]
-        english = sentence["english"]
+def read_source(source: SentenceSource) -> list[SentenceRecord]:
+    """Read all records from a source (run in a thread per source)."""
+    return list(source.read())
 
-        # Clean and tokenize
-        clean_text = clean_chinese(chinese)
-        if not clean_text:
-            skipped_count += 1
-            continue
 
-        tokens = list(jieba.cut(clean_text))
+def init_worker(hsk_words: dict[str, int], hsk_levels: dict[str, int]):
+    """Share the HSK lookups with a tokenization worker process."""
+    global _hsk_words, _hsk_levels
+    _hsk_words = hsk_words
+    _hsk_levels = hsk_levels
 
-        # Calculate HSK coverage
-        coverage = calculate_coverage(tokens, hsk_words)
 
-        if coverage < MIN_COVERAGE:
-            skipped_count += 1
-            continue
+def score_sentence(chinese: str) -> tuple[list[str], float] | None:
+    """Tokenize and score a sentence. Returns None if HSK coverage is too low."""
+    clean_text = clean_chinese(chinese)
+    if not clean_text:
+        return None
 
-        # Calculate difficulty score using multiple factors
-        difficulty_score = calculate_difficulty(tokens, hsk_words, hsk_levels, coverage)
+    tokens = list(jieba.cut(clean_text))
 
-        # Insert sentence
-        cursor.execute("""
-            INSERT INTO sentences (chinese, english, difficulty_score, tokens)
-            VALUES (?, ?, ?, ?)
-        """, (chinese, english, difficulty_score, json.dumps(tokens)))
+    coverage = calculate_coverage(tokens, _hsk_words)
+    if coverage < MIN_COVERAGE:
+        return None
 
-        sentence_id = cursor.lastrowid
+    return tokens, calculate_difficulty(tokens, _hsk_words, _hsk_levels, coverage)
 
-        # Create word-sentence links
-        for token in tokens:
-            if token in hsk_words:
-                word_id = hsk_words[token]
-                cursor.execute("""
-                    INSERT INTO sentence_words (sentence_id, word_id)
-                    VALUES (?, ?)
-                """, (sentence_id, word_id))
 
-        imported_count += 1
+def delete_sentences(cursor, sentence_ids: list[int]):
+    """Delete sentences along with their links, tags and progress."""
+    cursor.execute("SELECT name FROM sqlite_master WHERE type = 'table'")
+    tables = {row[0] for row in cursor.fetchall()}
+    params = [(sentence_id,) for sentence_id in sentence_ids]
+    for table in DEPENDENT_TABLES:
+        if table in tables:
+            cursor.executemany(f"DELETE FROM {table} WHERE sentence_id = ?", params)
+    cursor.executemany("DELETE FROM sentences WHERE id = ?", params)
+
 
-        if imported_count % 1000 == 0:
-            print(f"  Processed {imported_count} sentences...")
-            conn.commit()
+def remove_sources(cursor, names: list[str]) -> int:
+    """Delete every sentence imported from the given sources. Returns the count."""
+    placeholders = ",".join("?" * len(names))
+    cursor.execute(f"SELECT id FROM sentences WHERE source IN ({placeholders})", names)
+    sentence_ids = [row[0] for row in cursor.fetchall()]
+    delete_sentences(cursor, sentence_ids)
+    return len(sentence_ids)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Import sentences from corpus sources")
+    parser.add_argument("--source", action="append", dest="sources", metavar="NAME",
+                        help="only re-ingest this source (repeatable); other sources are left untouched")
+    parser.add_argument("--remove-source", action="append", dest="remove_sources", metavar="NAME",
+                        help="delete all sentences from this source, e.g. a corpus file that was removed (repeatable)")
+    args = parser.parse_args()
+
+    if args.remove_sources:
+        conn = sqlite3.connect(DB_FILE)
+        cursor = conn.cursor()
+        ensure_schema(cursor)
+        removed = remove_sources(cursor, args.remove_sources)
+        conn.commit()
+        conn.close()
+        print(f"Removed {removed} sentences from: {', '.join(args.remove_sources)}")
+        if not args.sources:
+            return
+
+    sources = get_sources()
+    if args.sources:
+        unknown = set(args.sources) - {s.name for s in sources}
+        if unknown:
+            print(f"Unknown source(s): {', '.join(sorted(unknown))}")
+            print(f"Available: {', '.join(s.name for s in sources)}")
+            exit(1)
+        sources = [s for s in sources if s.name in args.sources]
+
+    if not sources:
+        print("No sentence sources found")
+        exit(1)
+
+    # Read all sources in parallel
+    print(f"Loading sentences from {len(sources)} source(s)...")
+    with ThreadPoolExecutor(max_workers=len(sources)) as executor:
+        source_records = list(executor.map(read_source, sources))
+    for source, records in zip(sources, source_records):
+        print(f"  {source.name}: {len(records)} records from {source.path}")
+
+    # Connect to database
+    conn = sqlite3.connect(DB_FILE)
+    cursor = conn.cursor()
+    ensure_schema(cursor)
+
+    # Sentences from sources not being ingested (and user-added ones) take precedence
+    source_names = [s.name for s in sources]
+    placeholders = ",".join("?" * len(source_names))
+    cursor.execute(f"""
+        SELECT chinese FROM sentences
+        WHERE source IS NULL OR source NOT IN ({placeholders})
+    """, source_names)
+    seen_chinese = {row[0] for row in cursor.fetchall()}
+
+    # Existing rows for the ingested sources are updated in place to keep their ids
+    cursor.execute(f"SELECT chinese, id FROM sentences WHERE source IN ({placeholders})", source_names)
+    existing_ids = {row[0]: row[1] for row in cursor.fetchall()}
+
+    # Merge and deduplicate (earlier sources win)
+    sentences = []
+    for records in source_records:
+        for record in records:
+            if record.chinese not in seen_chinese:
+                seen_chinese.add(record.chinese)
+                sentences.append(record)
+
+    print(f"Loaded {len(sentences)} unique sentences")
+
+    # Load HSK words and levels
+    hsk_words = load_hsk_words(cursor)
+    hsk_levels = load_hsk_levels(cursor)
+    print(f"Loaded {len(hsk_words)} HSK words for filtering")
+
+    # Process sentences
+    imported_count = 0
+    updated_count = 0
+    skipped_count = 0
+
+    with ProcessPoolExecutor(initializer=init_worker, initargs=(hsk_words, hsk_levels)) as executor:
+        results = executor.map(score_sentence, [s.chinese for s in sentences], chunksize=500)
+
+        for sentence, result in zip(sentences, results):
+            if result is None:
+                skipped_count += 1
+                continue
+
+            tokens, difficulty_score = result
+            sentence_id = existing_ids.pop(sentence.chinese, None)
+
+            if sentence_id is None:
+                cursor.execute("""
+                    INSERT INTO sentences (chinese, english, difficulty_score, tokens, source, source_id)
+                    VALUES (?, ?, ?, ?, ?, ?)
+                """, (sentence.chinese, sentence.english, difficulty_score, json.dumps(tokens),
+                      sentence.source, sentence.source_id))
+                sentence_id = cursor.lastrowid
+                imported_count += 1
+            else:
+                cursor.execute("""
+                    UPDATE sentences
+                    SET english = ?, difficulty_score = ?, tokens = ?, source = ?, source_id = ?
+                    WHERE id = ?
+                """, (sentence.english, difficulty_score, json.dumps(tokens),
+                      sentence.source, sentence.source_id, sentence_id))
+                cursor.execute("DELETE FROM sentence_words WHERE sentence_id = ?", (sentence_id,))
+                updated_count += 1
+
+            # Create word-sentence links
+            for token in tokens:
+                if token in hsk_words:
+                    word_id = hsk_words[token]
+                    cursor.execute("""
+                        INSERT INTO sentence_words (sentence_id, word_id)
+                        VALUES (?, ?)
+                    """, (sentence_id, word_id))
+
+            processed = imported_count + updated_count
+            if processed % 1000 == 0:
+                print(f"  Processed {processed} sentences...")
+                conn.commit()
+
+    # Sentences no longer present in their source (or now below coverage)
+    removed_count = len(existing_ids)
+    delete_sentences(cursor, list(existing_ids.values()))
 
     conn.commit()
 
     print(f"\nImport complete:")
-    print(f"  Imported: {imported_count} sentences")
+    print(f"  Imported: {imported_count} new sentences")
+    print(f"  Updated: {updated_count} existing sentences")
+    print(f"  Removed: {removed_count} sentences no longer in their source")
     print(f"  Skipped: {skipped_count} sentences (< {MIN_COVERAGE*100}% HSK coverage)")
 
     # Verify
@@ -215,6 +343,10 @@ def main():
     print(f"  Total sentences: {total_sentences}")
     print(f"  Word-sentence links: {total_links}")
 
+    cursor.execute("SELECT COALESCE(source, 'user'), COUNT(*) FROM sentences GROUP BY source ORDER BY source")
+    for source, cnt in cursor.fetchall():
+        print(f"  {source}: {cnt} sentences")
+
     conn.close()
     print("Done!")
 
@@ -0,0 +1,197 @@
+#!/usr/bin/env python3
+"""
+Post-process generated TTS audio: trim leading/trailing silence, normalize
+loudness and transcode to low-bitrate mono MP3 using ffmpeg.
+Records duration, byte size and content hash in the database.
+
+Clips are processed in place, so public/audio/processed.json records the
+hash of every processed file. Rows that are deleted and re-created point at
+the same file (named after the text) and must not be re-encoded again.
+"""
+
+import hashlib
+import json
+import os
+import shutil
+import sqlite3
+import subprocess
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from pathlib import Path
+
+from build_audio_packs import mp3_duration
+
+if shutil.which("ffmpeg") is None:
+    print("Please install ffmpeg: https://ffmpeg.org/download.html")
+    exit(1)
+
+DB_FILE = Path(__file__).parent.parent / "chinese.db"
+PUBLIC_DIR = Path(__file__).parent.parent / "public"
+MANIFEST_FILE = PUBLIC_DIR / "audio" / "processed.json"
+
+# Output format (speech only needs mono at a low bitrate)
+TARGET_BITRATE = "32k"
+TARGET_SAMPLE_RATE = 24000
+TARGET_LOUDNESS = -16  # LUFS
+SILENCE_THRESHOLD = "-50dB"
+
+AUDIO_TABLES = ["words", "sentences"]
+AUDIO_COLUMNS = {
+    "audio_duration": "REAL",
+    "audio_bytes": "INTEGER",
+    "audio_hash": "TEXT",
+}
+
+# silenceremove only trims the start, so reverse to trim the end as well
+AUDIO_FILTER = ",".join([
+    f"silenceremove=start_periods=1:start_threshold={SILENCE_THRESHOLD}",
+    "areverse",
+    f"silenceremove=start_periods=1:start_threshold={SILENCE_THRESHOLD}",
+    "areverse",
+    f"loudnorm=I={TARGET_LOUDNESS}:TP=-1.5:LRA=11",
+])
+
+
+def ensure_audio_columns(cursor):
+    """Add audio metadata columns to older databases."""
+    for table in AUDIO_TABLES:
+        cursor.execute(f"PRAGMA table_info({table})")
+        existing = {row[1] for row in cursor.fetchall()}
+        for column, column_type in AUDIO_COLUMNS.items():
+            if column not in existing:
+                cursor.execute(f"ALTER TABLE {table} ADD COLUMN {column} {column_type}")
+
+
+def file_hash(path: Path) -> str:
+    """Content hash used to skip clips that are already processed."""
+    return hashlib.sha1(path.read_bytes()).hexdigest()
+
+
+def load_manifest() -> dict[str, str]:
+    """Load {audio_path: hash} of clips already processed."""
+    if MANIFEST_FILE.exists():
+        with open(MANIFEST_FILE, "r", encoding="utf-8") as f:
+            return json.load(f)
+    return {}
+
+
+def save_manifest(manifest: dict[str, str]):
+    """Write the processed-clip hashes to MANIFEST_FILE."""
+    with open(MANIFEST_FILE, "w", encoding="utf-8") as f:
+        json.dump(manifest, f, indent=2, sort_keys=True)
+
+
+def clip_metadata(path: Path) -> tuple[int, float, str]:
+    """Return (bytes, duration, hash) of a processed clip."""
+    data = path.read_bytes()
+    return len(data), mp3_duration(data), hashlib.sha1(data).hexdigest()
+
+
+def process_clip(path: Path) -> tuple[int, int, float, str]:
+    """Transcode a clip in place. Returns (old_bytes, new_bytes, duration, hash)."""
+    old_bytes = path.stat().st_size
+    tmp_path = path.with_suffix(".tmp.mp3")
+
+    # No ID3/Xing headers so clips can be concatenated into packs as raw frames
+    subprocess.run([
+        "ffmpeg", "-hide_banner", "-loglevel", "error", "-y",
+        "-i", str(path),
+        "-af", AUDIO_FILTER,
+        "-ac", "1",
+        "-ar", str(TARGET_SAMPLE_RATE),
+        "-c:a", "libmp3lame",
+        "-b:a", TARGET_BITRATE,
+        "-map_metadata", "-1",
+        "-id3v2_version", "0",
+        "-write_xing", "0",
+        str(tmp_path),
+    ], check=True)
+
+    os.replace(tmp_path, path)
+    return old_bytes, *clip_metadata(path)
+
+
+def main():
+    print(f"Connecting to database at {DB_FILE}...")
+    conn = sqlite3.connect(DB_FILE)
+    cursor = conn.cursor()
+
+    ensure_audio_columns(cursor)
+    conn.commit()
+
+    manifest = load_manifest()
+
+    # Collect clips whose content changed since they were last processed
+    pending = []
+    unchanged = 0
+    restored = 0
+    for table in AUDIO_TABLES:
+        cursor.execute(f"SELECT id, audio_path, audio_hash FROM {table} WHERE audio_path IS NOT NULL")
+        for row_id, audio_path, audio_hash in cursor.fetchall():
+            path = PUBLIC_DIR / audio_path.lstrip("/")
+            if not path.exists():
+                continue
+            digest = file_hash(path)
+            if digest not in (audio_hash, manifest.get(audio_path)):
+                pending.append((table, row_id, audio_path, path))
+                continue
+            unchanged += 1
+            manifest[audio_path] = digest
+            if audio_hash != digest:
+                # Re-created row for a clip that is already processed: only record its metadata
+                new_bytes, duration, _ = clip_metadata(path)
+                cursor.execute(f"""
+                    UPDATE {table} SET audio_duration = ?, audio_bytes = ?, audio_hash = ?
+                    WHERE id = ?
+                """, (round(duration, 3), new_bytes, digest, row_id))
+                restored += 1
+    conn.commit()
+
+    print(f"Clips to process: {len(pending)} ({unchanged} unchanged, {restored} already processed for new rows)")
+
+    total_before = 0
+    total_after = 0
+    failed = 0
+
+    with ProcessPoolExecutor() as executor:
+        futures = {
+            executor.submit(process_clip, path): (table, row_id, audio_path, path)
+            for table, row_id, audio_path, path in pending
+        }
+
+        for i, future in enumerate(as_completed(futures)):
+            table, row_id, audio_path, path = futures[future]
+            try:
+                old_bytes, new_bytes, duration, audio_hash = future.result()
+            except subprocess.CalledProcessError as e:
+                print(f"  Error processing {path.name}: {e}")
+                failed += 1
+                continue
+
+            cursor.execute(f"""
+                UPDATE {table} SET audio_duration = ?, audio_bytes = ?, audio_hash = ?
+                WHERE id = ?
+            """, (round(duration, 3), new_bytes, audio_hash, row_id))
+            manifest[audio_path] = audio_hash
+            total_before += old_bytes
+            total_after += new_bytes
+
+            if (i + 1) % 100 == 0:
+                print(f"  Processed {i + 1}/{len(pending)} clips...")
+                conn.commit()
+                save_manifest(manifest)
+
+    conn.commit()
+    conn.close()
+    save_manifest(manifest)
+
+    saved = total_before - total_after
+    print(f"\n=== Audio processing complete ===")
+    print(f"  Processed: {len(pending) - failed} clips")
+    if failed:
+        print(f"  Failed: {failed} clips")
+    print(f"  Size: {total_before / 1024:.0f} KB -> {total_after / 1024:.0f} KB")
+    print(f"  Saved: {saved / 1024:.0f} KB")
+
+
+if __name__ == "__main__":
+    main()
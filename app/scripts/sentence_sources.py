@@ -0,0 +1,88 @@
+"""
+Sentence corpus adapters for import_sentences.py.
+
+Each source streams SentenceRecord tuples. To add a corpus, either drop a
+tab-separated `chinese<TAB>english[<TAB>id]` file into data/corpora/
+(picked up as a TsvSource named after the file), or add an adapter class
+for a new format to get_sources(). Corpus files named after a built-in
+source (e.g. tatoeba.tsv) are skipped, since --source would match both.
+"""
+
+import warnings
+from abc import ABC, abstractmethod
+from pathlib import Path
+from typing import Iterator, NamedTuple
+
+DATA_DIR = Path(__file__).parent.parent.parent / "data"
+TATOEBA_FILE = DATA_DIR / "tatoeba-data.tsv"
+CORPORA_DIR = DATA_DIR / "corpora"
+
+
+class SentenceRecord(NamedTuple):
+    chinese: str
+    english: str
+    source: str
+    source_id: str
+
+
+class SentenceSource(ABC):
+    """Base adapter: a named corpus that yields sentence records."""
+
+    name: str = ""
+    path: Path
+
+    @abstractmethod
+    def read(self) -> Iterator[SentenceRecord]:
+        """Yield the corpus as SentenceRecord tuples."""
+
+
+class TatoebaSource(SentenceSource):
+    """Tatoeba export: group_id, chinese, eng_id, english."""
+
+    name = "tatoeba"
+
+    def __init__(self, path: Path = TATOEBA_FILE):
+        self.path = path
+
+    def read(self) -> Iterator[SentenceRecord]:
+        with open(self.path, "r", encoding="utf-8") as f:
+            for line in f:
+                parts = line.strip().split("\t")
+                if len(parts) >= 4:
+                    group_id, chinese, eng_id, english = parts[0], parts[1], parts[2], parts[3]
+                    yield SentenceRecord(chinese, english, self.name, group_id)
+
+
+class TsvSource(SentenceSource):
+    """Generic corpus: chinese, english and an optional id (defaults to line number)."""
+
+    def __init__(self, name: str, path: Path):
+        self.name = name
+        self.path = path
+
+    def read(self) -> Iterator[SentenceRecord]:
+        with open(self.path, "r", encoding="utf-8") as f:
+            for line_number, line in enumerate(f, start=1):
+                parts = line.strip().split("\t")
+                if len(parts) < 2 or not parts[0] or not parts[1]:
+                    continue
+                source_id = parts[2] if len(parts) >= 3 and parts[2] else str(line_number)
+                yield SentenceRecord(parts[0], parts[1], self.name, source_id)
+
+
+# Names taken by the built-in adapters
+BUILTIN_NAMES = {TatoebaSource.name}
+
+
+def get_sources() -> list[SentenceSource]:
+    """All available sources, in dedup priority order (earlier sources win)."""
+    sources: list[SentenceSource] = []
+    if TATOEBA_FILE.exists():
+        sources.append(TatoebaSource())
+    if CORPORA_DIR.is_dir():
+        for path in sorted(CORPORA_DIR.glob("*.tsv")):
+            if path.stem in BUILTIN_NAMES:
+                warnings.warn(f"Skipping {path}: '{path.stem}' is a built-in source name, rename the file")
+                continue
+            sources.append(TsvSource(path.stem, path))
+    return sources
@@ -85,16 +85,29 @@ def main():
     cursor.execute("CREATE INDEX IF NOT EXISTS idx_sentence_patterns_sentence ON sentence_patterns(sentence_id)")
     cursor.execute("CREATE INDEX IF NOT EXISTS idx_sentence_patterns_pattern ON sentence_patterns(pattern_id)")
 
-    # Insert patterns
+    # Upsert patterns by name so ids stay stable across re-runs
     print(f"Inserting {len(PATTERNS)} grammar patterns...")
+    cursor.execute("SELECT name, id FROM patterns")
+    existing_ids = {row[0]: row[1] for row in cursor.fetchall()}
     pattern_ids = {}
 
     for pattern in PATTERNS:
-        cursor.execute("""
-            INSERT INTO patterns (name, structure, description)
-            VALUES (?, ?, ?)
-        """, (pattern["name"], pattern["structure"], pattern["description"]))
-        pattern_ids[pattern["name"]] = cursor.lastrowid
+        if pattern["name"] in existing_ids:
+            pattern_id = existing_ids[pattern["name"]]
+            cursor.execute("""
+                UPDATE patterns SET structure = ?, description = ?
+                WHERE id = ?
+            """, (pattern["structure"], pattern["description"], pattern_id))
+        else:
+            cursor.execute("""
+                INSERT INTO patterns (name, structure, description)
+                VALUES (?, ?, ?)
+            """, (pattern["name"], pattern["structure"], pattern["description"]))
+            pattern_id = cursor.lastrowid
+        pattern_ids[pattern["name"]] = pattern_id
+
+    # Sentences persist between imports, so re-tag from scratch
+    cursor.execute("DELETE FROM sentence_patterns")
 
     # Load sentences
     cursor.execute("SELECT id, chinese FROM sentences")
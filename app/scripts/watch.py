@@ -0,0 +1,282 @@
+#!/usr/bin/env python3
+"""
+Watch data files and database tables, and re-run only the pipeline stages
+invalidated by each change.
+
+Usage:
+    python scripts/watch.py           # watch until interrupted
+    python scripts/watch.py --once    # run stale stages once and exit
+    python scripts/watch.py --audio   # also generate/process/pack audio
+"""
+
+import argparse
+import hashlib
+import json
+import sqlite3
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+from sentence_sources import get_sources
+from word_forms import DATA_DIR, HSK_FILE, OVERRIDES_FILE
+
+SCRIPTS_DIR = Path(__file__).parent
+APP_DIR = SCRIPTS_DIR.parent
+DB_FILE = APP_DIR / "chinese.db"
+STATE_FILE = APP_DIR / ".pipeline_state.json"
+
+POLL_INTERVAL = 1.0  # seconds
+DEBOUNCE = 2.0  # seconds without further changes before running
+
+# Stages in pipeline order
+STAGES = [
+    "import_hsk_words.py",
+    "apply_overrides.py",
+    "import_sentences.py",
+    "tag_patterns.py",
+    "generate_pinyin.py",
+    "generate_audio.py",
+    "process_audio.py",
+    "build_audio_packs.py",
+    "build_static_api.py",
+]
+AUDIO_STAGES = {"generate_audio.py", "process_audio.py", "build_audio_packs.py"}
+
+# Which stages each kind of change invalidates
+INVALIDATES = {
+    # Added or removed words change sentence coverage, so re-import every source
+    "hsk": [s for s in STAGES if s != "apply_overrides.py"],
+    # Overrides only update the affected words in place (ids are kept); word
+    # audio is synthesized from the hanzi, so it is unaffected
+    "overrides": ["apply_overrides.py", "build_static_api.py"],
+    "source": STAGES[2:],
+    "table:words": ["build_static_api.py", *AUDIO_STAGES],
+    "table:sentences": ["tag_patterns.py", "generate_pinyin.py", "build_static_api.py", *AUDIO_STAGES],
+}
+
+# Content that downstream stages read from each table
+TABLE_QUERIES = {
+    "table:words": "SELECT id, hanzi, pinyin, definition, hsk_level, audio_path FROM words ORDER BY id",
+    "table:sentences": "SELECT id, chinese, english, pinyin, audio_path FROM sentences ORDER BY id",
+}
+
+
+def input_files() -> dict[str, Path]:
+    """Watched input files keyed by fingerprint name."""
+    files = {"hsk": HSK_FILE, "overrides": OVERRIDES_FILE}
+    for source in get_sources():
+        files[f"source:{source.name}"] = source.path
+    return files
+
+
+def stat_signature() -> list:
+    """Cheap signature (size, mtime) of every watched file, used for polling."""
+    paths = list(input_files().values()) + [DB_FILE, DB_FILE.with_name(DB_FILE.name + "-wal")]
+    signature = []
+    for path in paths:
+        if path.exists():
+            stat = path.stat()
+            signature.append((str(path), stat.st_size, stat.st_mtime_ns))
+    return signature
+
+
+def input_fingerprints() -> tuple[dict[str, str], dict]:
+    """Content hashes of all watched input files, plus the overrides they hash.
+
+    The overrides are parsed from the same bytes that were hashed, so the
+    recorded snapshot always matches the recorded fingerprint.
+    """
+    fingerprints = {}
+    overrides = {}
+    for name, path in input_files().items():
+        if not path.exists():
+            continue
+        data = path.read_bytes()
+        fingerprints[name] = hashlib.sha1(data).hexdigest()
+        if name == "overrides":
+            overrides = json.loads(data.decode("utf-8"))
+    return fingerprints, overrides
+
+
+def table_fingerprints() -> dict[str, str]:
+    """Content hashes of the watched database tables."""
+    fingerprints = {}
+    if DB_FILE.exists():
+        conn = sqlite3.connect(DB_FILE)
+        cursor = conn.cursor()
+        for name, query in TABLE_QUERIES.items():
+            try:
+                cursor.execute(query)
+            except sqlite3.OperationalError:
+                continue  # table not created yet
+            digest = hashlib.sha1()
+            for row in cursor:
+                digest.update(repr(row).encode("utf-8"))
+            fingerprints[name] = digest.hexdigest()
+        conn.close()
+    return fingerprints
+
+
+def load_state() -> dict | None:
+    """Load the fingerprints recorded after the last successful run."""
+    if STATE_FILE.exists():
+        with open(STATE_FILE, "r", encoding="utf-8") as f:
+            return json.load(f)
+    return None
+
+
+def save_state(fingerprints: dict[str, str], overrides: dict) -> dict:
+    """Record fingerprints along with a snapshot of the overrides."""
+    state = {"fingerprints": fingerprints, "overrides": overrides}
+    with open(STATE_FILE, "w", encoding="utf-8") as f:
+        json.dump(state, f, ensure_ascii=False, indent=2)
+    return state
+
+
+def changed_overrides(old: dict, new: dict) -> list[str]:
+    """Hanzi whose override entry was added, removed or modified."""
+    return sorted(h for h in set(old) | set(new) if old.get(h) != new.get(h))
+
+
+def plan_stages(changes: list[str], with_audio: bool, override_hanzi: list[str] = (),
+                removed_sources: list[str] = ()) -> list[tuple[str, list[str]]]:
+    """Work out which stages to run (in order) and their arguments.
+
+    Sources in `removed_sources` no longer have a file, so their rows are
+    purged instead of re-ingested.
+    """
+    stages = set()
+    sources = []
+    full_import = False
+
+    for name in changes:
+        kind = "source" if name.startswith("source:") else name
+        if kind == "hsk":
+            full_import = True
+        elif kind == "source":
+            source = name.split(":", 1)[1]
+            if source not in removed_sources:
+                sources.append(source)
+        stages.update(INVALIDATES.get(kind, []))
+
+    # A full vocabulary import already applies the overrides
+    if full_import or not override_hanzi:
+        stages.discard("apply_overrides.py")
+    if not with_audio:
+        stages -= AUDIO_STAGES
+
+    plan = []
+    for stage in STAGES:
+        if stage not in stages:
+            continue
+        if stage == "apply_overrides.py":
+            plan.append((stage, list(override_hanzi)))
+        elif stage == "import_sentences.py":
+            if removed_sources:
+                remove_args = []
+                for source in sorted(removed_sources):
+                    remove_args += ["--remove-source", source]
+                plan.append((stage, remove_args))
+            if full_import:
+                plan.append((stage, []))
+            elif sources:
+                source_args = []
+                for source in sorted(sources):
+                    source_args += ["--source", source]
+                plan.append((stage, source_args))
+        else:
+            plan.append((stage, []))
+    return plan
+
+
+def run_stage(name: str, args: list[str]) -> bool:
+    """Run a pipeline script. Returns False if it failed."""
+    print(f"\n--- {name} {' '.join(args)}".rstrip())
+    result = subprocess.run([sys.executable, str(SCRIPTS_DIR / name), *args], cwd=APP_DIR)
+    if result.returncode != 0:
+        print(f"Error: {name} failed with exit code {result.returncode}")
+        return False
+    return True
+
+
+def run_changes(state: dict, with_audio: bool) -> dict:
+    """Run the stages invalidated since `state`. Returns the new state."""
+    try:
+        inputs, overrides = input_fingerprints()
+    except ValueError:
+        # Usually an editor mid-save; the next stat change retries
+        print(f"{OVERRIDES_FILE.name}: overrides file is not valid JSON, waiting for the next save")
+        return state
+    current = {**inputs, **table_fingerprints()}
+    previous = state["fingerprints"]
+    changes = sorted(name for name in set(previous) | set(current) if previous.get(name) != current.get(name))
+    if not changes:
+        return state
+
+    print(f"\n{'='*60}")
+    print(f"Changed: {', '.join(changes)}")
+    affected = []
+    if "overrides" in changes:
+        affected = changed_overrides(state.get("overrides", {}), overrides)
+        print(f"Overrides changed for: {', '.join(affected) or '(none)'}")
+    removed_sources = [
+        name.split(":", 1)[1] for name in changes
+        if name.startswith("source:") and name not in current
+    ]
+
+    for stage, args in plan_stages(changes, with_audio, affected, removed_sources):
+        if not run_stage(stage, args):
+            # Keep the old state so the failed work is retried on the next change
+            print("Stopping; will retry after the next change.")
+            return state
+
+    # Record the inputs as they were when the run started, so edits made while
+    # stages were running are picked up next time. Stages write to the
+    # database, so only the tables are fingerprinted again.
+    state = save_state({**inputs, **table_fingerprints()}, overrides)
+    print(f"\n{'='*60}")
+    print("Up to date. Watching for changes...")
+    return state
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Re-run pipeline stages when data changes")
+    parser.add_argument("--once", action="store_true", help="run stale stages once and exit")
+    parser.add_argument("--audio", action="store_true", help="also run the audio stages")
+    parser.add_argument("--debounce", type=float, default=DEBOUNCE, help="seconds to wait for changes to settle")
+    args = parser.parse_args()
+
+    state = load_state()
+    if state is None:
+        # Nothing is known to be in sync yet, so every input counts as changed
+        print(f"No pipeline state found in {STATE_FILE}, running the full pipeline")
+        state = {"fingerprints": {}, "overrides": {}}
+
+    state = run_changes(state, args.audio)
+    if args.once:
+        return
+
+    print(f"Watching {DATA_DIR} and {DB_FILE} (Ctrl+C to stop)...")
+    last_signature = stat_signature()
+    last_change = None
+
+    try:
+        while True:
+            time.sleep(POLL_INTERVAL)
+            signature = stat_signature()
+            if signature != last_signature:
+                last_signature = signature
+                last_change = time.monotonic()
+                continue
+
+            if last_change is not None and time.monotonic() - last_change >= args.debounce:
+                last_change = None
+                state = run_changes(state, args.audio)
+                last_signature = stat_signature()
+    except KeyboardInterrupt:
+        print("\nStopped.")
+
+
+if __name__ == "__main__":
+    main()
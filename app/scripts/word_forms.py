@@ -0,0 +1,70 @@
+"""
+Form selection shared by import_hsk_words.py and build_hsk_index.py.
+
+hsk-complete.json lists several forms (readings) per word; these helpers
+pick the one used for learning, applying data/word_overrides.json.
+"""
+
+import json
+from pathlib import Path
+
+DATA_DIR = Path(__file__).parent.parent.parent / "data"
+HSK_FILE = DATA_DIR / "hsk-complete.json"
+OVERRIDES_FILE = DATA_DIR / "word_overrides.json"
+
+
+def is_unsuitable_form(form: dict) -> bool:
+    """Check if a form should be skipped (surname, archaic, variant, etc.)."""
+    meanings = form.get("meanings", [])
+    if not meanings:
+        return True
+    first_meaning = meanings[0].lower()
+    # Skip surname-only, archaic, variant, and euphemistic forms
+    skip_patterns = ["surname ", "(archaic)", "variant of", "old variant", "euphemistic"]
+    return any(p in first_meaning for p in skip_patterns)
+
+
+def load_overrides() -> dict:
+    """Load word overrides from JSON file."""
+    if OVERRIDES_FILE.exists():
+        with open(OVERRIDES_FILE, "r", encoding="utf-8") as f:
+            return json.load(f)
+    return {}
+
+
+def select_best_form(forms: list[dict], hanzi: str, overrides: dict) -> dict:
+    """Select the best form for HSK learning.
+
+    Priority:
+    1. Check overrides file for manual corrections
+    2. First form with lowercase pinyin (common pronunciation)
+    3. First form that isn't surname/archaic/variant
+    4. Fallback to first form
+    """
+    if not forms:
+        return {}
+
+    # Check overrides first
+    if hanzi in overrides:
+        target_pinyin = overrides[hanzi].get("pinyin")
+        for form in forms:
+            pinyin = form.get("transcriptions", {}).get("pinyin", "")
+            if pinyin == target_pinyin:
+                return form
+
+    # First pass: find first suitable form with lowercase pinyin
+    for form in forms:
+        if is_unsuitable_form(form):
+            continue
+        pinyin = form.get("transcriptions", {}).get("pinyin", "")
+        if pinyin and pinyin[0].islower():
+            return form
+
+    # Second pass: any suitable form
+    for form in forms:
+        if is_unsuitable_form(form):
+            continue
+        return form
+
+    # Fallback to first form if all are unsuitable
+    return forms[0]
@@ -1,5 +1,6 @@
 import { NextResponse } from "next/server";
 import { pinyin } from "pinyin-pro";
+import { lookupHskWord } from "@/lib/hsk-index";
 
 export async function POST(request: Request) {
   try {
@@ -12,6 +13,12 @@ export async function POST(request: Request) {
       );
     }
 
+    // Whole HSK words use the curated reading (handles polyphones like 说/着)
+    const entry = lookupHskWord(text.trim());
+    if (entry?.pinyin) {
+      return NextResponse.json({ pinyin: entry.pinyin });
+    }
+
     const result = pinyin(text, {
       toneType: "symbol",
       type: "string",
@@ -2,6 +2,7 @@ import { NextResponse } from "next/server";
 import { db } from "@/lib/db";
 import { words, wordProgress, wordTags } from "@/lib/db/schema";
 import { eq, like, or, asc, count, and, inArray, notInArray } from "drizzle-orm";
+import { lookupHskWord } from "@/lib/hsk-index";
 
 export async function GET(request: Request) {
   const { searchParams } = new URL(request.url);
@@ -117,7 +118,7 @@ export async function POST(request: Request) {
       .insert(words)
       .values({
         hanzi: hanzi.trim(),
-        pinyin: pinyin?.trim() || "",
+        pinyin: pinyin?.trim() || lookupHskWord(hanzi.trim())?.pinyin || "",
         definition: definition.trim(),
         hskLevel: 0, // User-added words default to level 0
         frequency: 0,
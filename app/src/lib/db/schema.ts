@@ -14,6 +14,9 @@ export const words = sqliteTable("words", {
   frequency: integer("frequency"),
   classifiers: text("classifiers", { mode: "json" }).$type<string[]>(),
   audioPath: text("audio_path"),
+  audioDuration: real("audio_duration"),
+  audioBytes: integer("audio_bytes"),
+  audioHash: text("audio_hash"),
 });
 
 // Sentences table - Tatoeba sentences
@@ -24,7 +27,12 @@ export const sentences = sqliteTable("sentences", {
   pinyin: text("pinyin"),
   difficultyScore: real("difficulty_score"),
   audioPath: text("audio_path"),
+  audioDuration: real("audio_duration"),
+  audioBytes: integer("audio_bytes"),
+  audioHash: text("audio_hash"),
   tokens: text("tokens", { mode: "json" }).$type<string[]>(),
+  source: text("source"), // corpus name, null for user-added sentences
+  sourceId: text("source_id"), // id within the source corpus
 });
 
 // Junction table for words <-> sentences
@@ -0,0 +1,40 @@
+import Database from "better-sqlite3";
+import fs from "fs";
+
+// Compiled by scripts/build_hsk_index.py from data/hsk-complete.json
+const INDEX_FILE = "../data/hsk-index.db";
+
+export interface HskEntry {
+  simplified: string;
+  traditional: string | null;
+  pinyin: string | null; // reading selected for learning (overrides applied)
+  levels: string[];
+  frequency: number | null;
+}
+
+// Look up an HSK entry by its exact simplified or traditional form
+export function lookupHskWord(hanzi: string): HskEntry | undefined {
+  // The index is optional; callers fall back to their own logic without it
+  if (!fs.existsSync(INDEX_FILE)) return undefined;
+
+  // Opened per lookup rather than cached: build_hsk_index.py replaces the
+  // file, which fails on Windows while it is held open
+  const db = new Database(INDEX_FILE, { readonly: true, fileMustExist: true });
+  let row: (Omit<HskEntry, "levels"> & { levels: string | null }) | undefined;
+  try {
+    row = db
+      .prepare(
+        `SELECT e.simplified, e.traditional, e.pinyin, e.levels, e.frequency
+         FROM lookup l JOIN entries e ON e.id = l.entry_id
+         WHERE l.key = ? AND l.kind IN ('simplified', 'traditional')
+         ORDER BY e.id
+         LIMIT 1`
+      )
+      .get(hanzi) as typeof row;
+  } finally {
+    db.close();
+  }
+
+  if (!row) return undefined;
+  return { ...row, levels: row.levels ? JSON.parse(row.levels) : [] };
+}